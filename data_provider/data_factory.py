@@ -43,6 +43,7 @@ def data_provider(args, flag):
             batch_size=batch_size,
             shuffle=shuffle_flag,
             num_workers=args.num_workers,
+            pin_memory=args.use_gpu,
             drop_last=drop_last)
         return data_set, data_loader
     elif args.task_name == 'classification':
@@ -58,6 +59,7 @@ def data_provider(args, flag):
             batch_size=batch_size,
             shuffle=shuffle_flag,
             num_workers=args.num_workers,
+            pin_memory=args.use_gpu,
             drop_last=drop_last,
             collate_fn=lambda x: collate_fn(x, max_len=args.seq_len)
         )
@@ -83,5 +85,6 @@ def data_provider(args, flag):
             batch_size=batch_size,
             shuffle=shuffle_flag,
             num_workers=args.num_workers,
+            pin_memory=args.use_gpu,
             drop_last=drop_last)
         return data_set, data_loader
@@ -109,7 +109,12 @@ class Dataset_ETT_hour(Dataset):
                 self.data_x, self.data_y, self.args
             )
 
-        self.data_stamp = data_stamp
+        # emit the model dtypes so pinned batches need no cast on the device
+        self.data_x = self.data_x.astype(np.float32)
+        self.data_y = self.data_y.astype(np.float32)
+        self.data_stamp = data_stamp.astype(
+            np.int32 if self.timeenc == 0 else np.float32
+        )
 
     def __getitem__(self, index):
         s_begin = index
@@ -226,7 +231,12 @@ class Dataset_ETT_minute(Dataset):
                 self.data_x, self.data_y, self.args
             )
 
-        self.data_stamp = data_stamp
+        # emit the model dtypes so pinned batches need no cast on the device
+        self.data_x = self.data_x.astype(np.float32)
+        self.data_y = self.data_y.astype(np.float32)
+        self.data_stamp = data_stamp.astype(
+            np.int32 if self.timeenc == 0 else np.float32
+        )
 
     def __getitem__(self, index):
         s_begin = index
@@ -343,7 +353,12 @@ class Dataset_Custom(Dataset):
                 self.data_x, self.data_y, self.args
             )
 
-        self.data_stamp = data_stamp
+        # emit the model dtypes so pinned batches need no cast on the device
+        self.data_x = self.data_x.astype(np.float32)
+        self.data_y = self.data_y.astype(np.float32)
+        self.data_stamp = data_stamp.astype(
+            np.int32 if self.timeenc == 0 else np.float32
+        )
 
     def __getitem__(self, index):
         s_begin = index
@@ -419,10 +434,10 @@ class Dataset_M4(Dataset):
         self.timeseries = [ts for ts in training_values]
 
     def __getitem__(self, index):
-        insample = np.zeros((self.seq_len, 1))
-        insample_mask = np.zeros((self.seq_len, 1))
-        outsample = np.zeros((self.pred_len + self.label_len, 1))
-        outsample_mask = np.zeros((self.pred_len + self.label_len, 1))  # m4 dataset
+        insample = np.zeros((self.seq_len, 1), dtype=np.float32)
+        insample_mask = np.zeros((self.seq_len, 1), dtype=np.float32)
+        outsample = np.zeros((self.pred_len + self.label_len, 1), dtype=np.float32)
+        outsample_mask = np.zeros((self.pred_len + self.label_len, 1), dtype=np.float32)  # m4 dataset
 
         sampled_timeseries = self.timeseries[index]
         cut_point = np.random.randint(
@@ -1013,9 +1028,9 @@ class Dataset_Meteorology(Dataset):
         else:
             pass
 
-        self.data_x = data[border1:border2]
-        self.data_y = data[border1:border2]
-        self.covariate = repeat_era5[border1:border2]
+        self.data_x = data[border1:border2].astype(np.float32)
+        self.data_y = data[border1:border2].astype(np.float32)
+        self.covariate = repeat_era5[border1:border2].astype(np.float32)
 
     def __getitem__(self, index):
         station_id = index // self.tot_len
@@ -45,7 +45,7 @@ class Exp_Anomaly_Detection(Exp_Basic):
         self.model.eval()
         with torch.no_grad():
             for i, (batch_x, _) in enumerate(vali_loader):
-                batch_x = batch_x.float().to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
 
                 outputs = self.model(batch_x, None, None, None)
 
@@ -87,7 +87,7 @@ class Exp_Anomaly_Detection(Exp_Basic):
                 iter_count += 1
                 model_optim.zero_grad()
 
-                batch_x = batch_x.float().to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
 
                 outputs = self.model(batch_x, None, None, None)
 
@@ -143,7 +143,7 @@ class Exp_Anomaly_Detection(Exp_Basic):
         # (1) stastic on the train set
         with torch.no_grad():
             for i, (batch_x, batch_y) in enumerate(train_loader):
-                batch_x = batch_x.float().to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
                 # reconstruction
                 outputs = self.model(batch_x, None, None, None)
                 # criterion
@@ -158,7 +158,7 @@ class Exp_Anomaly_Detection(Exp_Basic):
         attens_energy = []
         test_labels = []
         for i, (batch_x, batch_y) in enumerate(test_loader):
-            batch_x = batch_x.float().to(self.device)
+            batch_x = batch_x.to(self.device, non_blocking=True)
             # reconstruction
             outputs = self.model(batch_x, None, None, None)
             # criterion
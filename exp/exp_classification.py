@@ -51,9 +51,9 @@ class Exp_Classification(Exp_Basic):
         self.model.eval()
         with torch.no_grad():
             for i, (batch_x, label, padding_mask) in enumerate(vali_loader):
-                batch_x = batch_x.float().to(self.device)
-                padding_mask = padding_mask.float().to(self.device)
-                label = label.to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
+                padding_mask = padding_mask.to(self.device, non_blocking=True).float()
+                label = label.to(self.device, non_blocking=True)
 
                 outputs = self.model(batch_x, padding_mask, None, None)
 
@@ -104,9 +104,9 @@ class Exp_Classification(Exp_Basic):
                 iter_count += 1
                 model_optim.zero_grad()
 
-                batch_x = batch_x.float().to(self.device)
-                padding_mask = padding_mask.float().to(self.device)
-                label = label.to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
+                padding_mask = padding_mask.to(self.device, non_blocking=True).float()
+                label = label.to(self.device, non_blocking=True)
 
                 outputs = self.model(batch_x, padding_mask, None, None)
                 loss = criterion(outputs, label.long().squeeze(-1))
@@ -157,9 +157,9 @@ class Exp_Classification(Exp_Basic):
         self.model.eval()
         with torch.no_grad():
             for i, (batch_x, label, padding_mask) in enumerate(test_loader):
-                batch_x = batch_x.float().to(self.device)
-                padding_mask = padding_mask.float().to(self.device)
-                label = label.to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
+                padding_mask = padding_mask.to(self.device, non_blocking=True).float()
+                label = label.to(self.device, non_blocking=True)
 
                 outputs = self.model(batch_x, padding_mask, None, None)
 
@@ -41,8 +41,8 @@ class Exp_Imputation(Exp_Basic):
         self.model.eval()
         with torch.no_grad():
             for i, (batch_x, batch_y, batch_x_mark, batch_y_mark) in enumerate(vali_loader):
-                batch_x = batch_x.float().to(self.device)
-                batch_x_mark = batch_x_mark.float().to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
+                batch_x_mark = batch_x_mark.to(self.device, non_blocking=True)
 
                 # random mask
                 B, T, N = batch_x.shape
@@ -102,8 +102,8 @@ class Exp_Imputation(Exp_Basic):
                 iter_count += 1
                 model_optim.zero_grad()
 
-                batch_x = batch_x.float().to(self.device)
-                batch_x_mark = batch_x_mark.float().to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
+                batch_x_mark = batch_x_mark.to(self.device, non_blocking=True)
 
                 # random mask
                 B, T, N = batch_x.shape
@@ -169,8 +169,8 @@ class Exp_Imputation(Exp_Basic):
         self.model.eval()
         with torch.no_grad():
             for i, (batch_x, batch_y, batch_x_mark, batch_y_mark) in enumerate(test_loader):
-                batch_x = batch_x.float().to(self.device)
-                batch_x_mark = batch_x_mark.float().to(self.device)
+                batch_x = batch_x.to(self.device, non_blocking=True)
+                batch_x_mark = batch_x_mark.to(self.device, non_blocking=True)
 
                 # random mask
                 B, T, N = batch_x.shape
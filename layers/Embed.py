@@ -1,31 +1,79 @@
+import functools
 import torch
 import torch.nn as nn
-from einops import rearrange, repeat
 from torch import Tensor
 import math
 import torch.nn.functional as F
 
 
+def _build_sinusoid(n, d_model, device=None):
+    # [n, d_model] sinusoid table with sin/cos interleaved along d_model,
+    # computed once in log space and written in a single contiguous pass
+    position = torch.arange(n, dtype=torch.float32, device=device).unsqueeze(1)
+    div_term = torch.exp(
+        torch.arange(0, d_model, 2, dtype=torch.float32, device=device)
+        * -(math.log(10000.0) / d_model)
+    )
+    angle = position * div_term
+    return torch.stack([angle.sin(), angle.cos()], dim=-1).reshape(n, d_model)
+
+
+# torch.compiler only exists from torch 2.1; without it nothing is compiled,
+# so there is nothing to keep out of graphs either
+_compiler_disable = getattr(getattr(torch, "compiler", None), "disable", lambda fn: fn)
+
+
+@functools.lru_cache(maxsize=None)
+def _positional_table(d_model, max_len, device, dtype):
+    # one read-only table per (d_model, max_len, device, dtype), shared by
+    # every PositionalEmbedding instead of one copy per embedding module
+    pe = _build_sinusoid(max_len, d_model, device)
+    return pe.unsqueeze(0).to(dtype).contiguous()
+
+
 class PositionalEmbedding(nn.Module):
     def __init__(self, d_model, max_len=5000):
         super(PositionalEmbedding, self).__init__()
-        # Compute the positional encodings once in log space.
-        pe = torch.zeros(max_len, d_model).float()
-        pe.require_grad = False
-
-        position = torch.arange(0, max_len).float().unsqueeze(1)
-        div_term = (
-            torch.arange(0, d_model, 2).float() * -(math.log(10000.0) / d_model)
-        ).exp()
+        self.d_model = d_model
+        self.max_len = max_len
+        # not persistent: the table is deterministic, so keep it out of
+        # checkpoints; it is fetched lazily on the device of the first input
+        # rather than built on CPU here and copied over by .to(device)
+        self.register_buffer("pe", None, persistent=False)
+        # follows the module dtype (.half()/.double()), not the input dtype,
+        # so autocast inputs do not pin a low-precision table
+        self._table_dtype = torch.float32
+
+    def _apply(self, fn, *args, **kwargs):
+        super(PositionalEmbedding, self)._apply(fn, *args, **kwargs)
+        self._table_dtype = fn(torch.empty(0, dtype=self._table_dtype)).dtype
+        # .to()/.half()/.cuda() produce a private copy; point back at the
+        # shared table for the new device and dtype
+        if self.pe is not None:
+            self.pe = _positional_table(
+                self.d_model, self.max_len, self.pe.device, self._table_dtype
+            )
+        return self
 
-        pe[:, 0::2] = torch.sin(position * div_term)
-        pe[:, 1::2] = torch.cos(position * div_term)
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # checkpoints from before the shared table stored pe as a buffer
+        state_dict.pop(prefix + "pe", None)
+        super(PositionalEmbedding, self)._load_from_state_dict(
+            state_dict, prefix, *args, **kwargs
+        )
 
-        pe = pe.unsqueeze(0)
-        self.register_buffer("pe", pe)
+    @_compiler_disable
+    def _fetch_table(self, x):
+        # kept out of torch.compile graphs so the cached table is looked up
+        # rather than traced and rebuilt inside the graph
+        self.pe = _positional_table(
+            self.d_model, self.max_len, x.device, self._table_dtype
+        )
 
-    def forward(self, x):
-        return self.pe[:, : x.size(1)]
+    def forward(self, x, offset=0):
+        if self.pe is None or self.pe.device != x.device:
+            self._fetch_table(x)
+        return self.pe.narrow(1, offset, x.size(1))
 
 
 class TokenEmbedding(nn.Module):
@@ -47,34 +95,19 @@ class TokenEmbedding(nn.Module):
                 )
 
     def forward(self, x):
-        x = self.tokenConv(x.permute(0, 2, 1)).transpose(1, 2)
-        return x
-
-
-class FixedEmbedding(nn.Module):
-    def __init__(self, c_in, d_model):
-        super(FixedEmbedding, self).__init__()
-
-        w = torch.zeros(c_in, d_model).float()
-        w.require_grad = False
-
-        position = torch.arange(0, c_in).float().unsqueeze(1)
-        div_term = (
-            torch.arange(0, d_model, 2).float() * -(math.log(10000.0) / d_model)
-        ).exp()
-
-        w[:, 0::2] = torch.sin(position * div_term)
-        w[:, 1::2] = torch.cos(position * div_term)
-
-        self.emb = nn.Embedding(c_in, d_model)
-        self.emb.weight = nn.Parameter(w, requires_grad=False)
-
-    def forward(self, x):
-        return self.emb(x).detach()
+        # circular conv computed directly on [B, L, C]: pad the sequence ends,
+        # take sliding windows and project them with the conv kernel, which
+        # avoids permuting the input to [B, C, L] and the output back again
+        k = self.tokenConv.kernel_size[0]
+        p = self.tokenConv.padding[0]
+        x = torch.cat([x[:, x.size(1) - p :], x, x[:, :p]], dim=1)
+        x = x.unfold(1, k, 1)  # [B, L, C, k]
+        return F.linear(x.flatten(2), self.tokenConv.weight.flatten(1))
 
 
 class TemporalEmbedding(nn.Module):
-    def __init__(self, d_model, embed_type="fixed", freq="h"):
+    def __init__(self, d_model, embed_type="fixed", freq="h", storage="fp32"):
+        # storage: fp32, bf16, int8 (fixed table only)
         super(TemporalEmbedding, self).__init__()
 
         minute_size = 4
@@ -83,25 +116,100 @@ class TemporalEmbedding(nn.Module):
         day_size = 32
         month_size = 13
 
-        Embed = FixedEmbedding if embed_type == "fixed" else nn.Embedding
+        # one table for all time features, ordered as the columns of x_mark
+        sizes = [month_size, day_size, weekday_size, hour_size]
         if freq == "t":
-            self.minute_embed = Embed(minute_size, d_model)
-        self.hour_embed = Embed(hour_size, d_model)
-        self.weekday_embed = Embed(weekday_size, d_model)
-        self.day_embed = Embed(day_size, d_model)
-        self.month_embed = Embed(month_size, d_model)
+            sizes.append(minute_size)
+        self.n_feats = len(sizes)
+        self.register_buffer(
+            "offsets",
+            torch.tensor(
+                [sum(sizes[:i]) for i in range(self.n_feats)], dtype=torch.int32
+            ),
+            persistent=False,
+        )
+        self.register_buffer(
+            "sizes", torch.tensor(sizes, dtype=torch.int32), persistent=False
+        )
 
-    def forward(self, x):
-        x = x.long()
-        minute_x = (
-            self.minute_embed(x[:, :, 4]) if hasattr(self, "minute_embed") else 0.0
+        self.storage = storage
+        self._table_dtype = torch.float32
+        if embed_type == "fixed":
+            # each feature keeps its own sinusoid table, stacked row-wise
+            w = torch.cat([_build_sinusoid(size, d_model) for size in sizes])
+            match storage:
+                case "fp32":
+                    pass
+                case "bf16":
+                    w = w.to(torch.bfloat16)
+                case "int8":
+                    # symmetric per-row quantization, widened in _table
+                    scale = w.abs().amax(dim=1, keepdim=True).clamp(min=1e-8) / 127
+                    self.register_buffer("scale", scale, persistent=False)
+                    w = (w / scale).round().to(torch.int8)
+                case _:
+                    raise ValueError(f"storage {storage} is not supported.")
+            self.register_buffer("weight", w, persistent=False)
+        else:
+            if storage != "fp32":
+                raise ValueError(f"storage {storage} needs embed_type fixed.")
+            # same N(0, 1) init as nn.Embedding
+            self.weight = nn.Parameter(torch.randn(sum(sizes), d_model))
+
+    def _apply(self, fn, *args, **kwargs):
+        super(TemporalEmbedding, self)._apply(fn, *args, **kwargs)
+        # .half()/.double() cast every floating buffer; a bf16 table keeps its
+        # storage dtype, only the dtype it is widened to follows the module
+        self._table_dtype = fn(torch.empty(0, dtype=self._table_dtype)).dtype
+        if self.storage == "bf16" and self.weight.dtype != torch.bfloat16:
+            self.weight = self.weight.to(torch.bfloat16)
+        return self
+
+    def _load_from_state_dict(self, state_dict, prefix, *args, **kwargs):
+        # checkpoints from before the fused table hold one table per feature:
+        # learned tables are stacked in column order, fixed ones are rebuilt
+        names = ["month", "day", "weekday", "hour", "minute"]
+        legacy = [prefix + name + "_embed.weight" for name in names[: self.n_feats]]
+        if all(key in state_dict for key in legacy):
+            state_dict[prefix + "weight"] = torch.cat(
+                [state_dict.pop(key) for key in legacy]
+            )
+        for name in names:
+            state_dict.pop(prefix + name + "_embed.emb.weight", None)
+        super(TemporalEmbedding, self)._load_from_state_dict(
+            state_dict, prefix, *args, **kwargs
         )
-        hour_x = self.hour_embed(x[:, :, 3])
-        weekday_x = self.weekday_embed(x[:, :, 2])
-        day_x = self.day_embed(x[:, :, 1])
-        month_x = self.month_embed(x[:, :, 0])
 
-        return hour_x + weekday_x + day_x + month_x + minute_x
+    def indices(self, x):
+        # [B, L, F] time features -> int32 row indices into the fused table;
+        # integer inputs of the right dtype are used without a copy
+        x = x[:, :, : self.n_feats]
+        if x.dtype != torch.int32:
+            x = x.to(torch.int32)
+        # an out-of-range value would read the next feature's rows of the
+        # fused table; point it outside the table so the lookup raises
+        return (x + self.offsets).masked_fill((x < 0) | (x >= self.sizes), -1)
+
+    def _table(self):
+        # a low-precision table has under a hundred rows, so it is widened
+        # whole to the module dtype and every call still does a single lookup
+        match self.storage:
+            case "bf16":
+                return self.weight.to(self._table_dtype)
+            case "int8":
+                return self.weight.to(self._table_dtype) * self.scale
+        return self.weight
+
+    def lookup(self, x):
+        # [B, L, F] -> [B, L, F, D], one embedding per time feature
+        return F.embedding(self.indices(x), self._table())
+
+    def forward(self, x):
+        # every time step is a bag of F rows summed in-kernel, so the
+        # intermediate [B, L, F, D] tensor is never materialised
+        idx = self.indices(x)
+        out = F.embedding_bag(idx.reshape(-1, self.n_feats), self._table(), mode="sum")
+        return out.view(idx.size(0), idx.size(1), -1)
 
 
 class TimeFeatureEmbedding(nn.Module):
@@ -128,11 +236,13 @@ class DataEmbeddingWithExoPromptTuning(nn.Module):
         num_virtual_tokens: int = 10,
         exo_prompt_dim: int = 254,
         exo_prompt_projector_hidden_size: int = 512,
+        temporal_storage="fp32",  # fp32, bf16, int8
     ):
         super(DataEmbeddingWithExoPromptTuning, self).__init__()
 
         self.prompt_tuning_type = prompt_tuning_type
         self.num_virtual_tokens = num_virtual_tokens
+        self.d_model = d_model
         self.exo_prompt_dim = exo_prompt_dim
         self.exo_prompt_projector = nn.Identity()
         self.exo_prompt_projector_hidden_size = exo_prompt_projector_hidden_size
@@ -148,8 +258,11 @@ class DataEmbeddingWithExoPromptTuning(nn.Module):
                         exo_prompt_projector_hidden_size, d_model * num_virtual_tokens
                     ),
                 )
+                # unbound, so DataParallel replicas pass their own self
+                self._forward_impl = type(self)._forward_two_layer_mlp
             case "brute_concat":
                 self.exo_prompt_projector = None
+                self._forward_impl = type(self)._forward_brute_concat
             case _:
                 raise ValueError(
                     f"prompt_tuning_type {prompt_tuning_type} is not supported."
@@ -165,48 +278,52 @@ class DataEmbeddingWithExoPromptTuning(nn.Module):
         )
         self.position_embedding = PositionalEmbedding(d_model=d_model)
         self.temporal_embedding = (
-            TemporalEmbedding(d_model=d_model, embed_type=embed_type, freq=freq)
+            TemporalEmbedding(
+                d_model=d_model,
+                embed_type=embed_type,
+                freq=freq,
+                storage=temporal_storage,
+            )
             if embed_type != "timeF"
             else TimeFeatureEmbedding(d_model=d_model, embed_type=embed_type, freq=freq)
         )
         self.dropout = nn.Dropout(p=dropout)
 
     def forward(self, x, x_mark, exo_prompt: Tensor):
-        if self.prompt_tuning_type in ["brute_concat"]:
-            exo_prompt = repeat(exo_prompt, "b v -> b l v", l=x.size(1))
-        elif self.prompt_tuning_type in ["two_layer_mlp"]:
-            exo_prompt = self.exo_prompt_projector(exo_prompt)
-            exo_prompt = rearrange(
-                exo_prompt, "b (l d) -> b l d", l=self.num_virtual_tokens
-            )
+        return self._forward_impl(self, x, x_mark, exo_prompt)
 
-        if x_mark is None:
-            if self.prompt_tuning_type in ["brute_concat"]:
-                x = torch.cat([exo_prompt, x], dim=2)
-                x = self.value_embedding(x)
-            else:
-                x = self.value_embedding(x)
-                x = torch.cat([exo_prompt, x], dim=1)
-            x = x + self.position_embedding(x)
-        else:
-            if self.prompt_tuning_type in ["brute_concat"]:
-                x = torch.cat([exo_prompt, x], dim=2)  # [B, L, (V + I_S)]
-                x = self.value_embedding(x)  # [B, L, D]
-            else:
-                x = self.value_embedding(x)  # [B, L, D]
-                x = torch.cat([exo_prompt, x], dim=1)  # [B, (V + L), D]
-            x = x + self.position_embedding(x)
-
-            # handling temporal embedding
-            temporal_embedding = self.temporal_embedding(x_mark)
-            if self.prompt_tuning_type not in ["brute_concat"]:
-                temporal_filler = torch.zeros_like(exo_prompt)
-                temporal_embedding = torch.cat(
-                    [temporal_filler, temporal_embedding], dim=1
-                )
-            x = x + temporal_embedding
+    def _forward_two_layer_mlp(self, x, x_mark, exo_prompt: Tensor):
+        exo_prompt = self.exo_prompt_projector(exo_prompt)
+        exo_prompt = exo_prompt.view(
+            exo_prompt.size(0), self.num_virtual_tokens, self.d_model
+        )
 
-        return self.dropout(x)
+        # embed the data and the virtual tokens separately and concatenate
+        # at the end, so the prefix needs no zero temporal filler; the data
+        # keeps the positions after the num_virtual_tokens prefix
+        x = self.value_embedding(x)  # [B, L, D]
+        x = x + self.position_embedding(x, offset=self.num_virtual_tokens)
+        if x_mark is not None:
+            x = x + self.temporal_embedding(x_mark)
+        exo_prompt = exo_prompt + self.position_embedding(exo_prompt)
+        x = torch.cat([exo_prompt, x], dim=1)  # [B, (V + L), D]
+
+        if self.training and self.dropout.p > 0:
+            x = self.dropout(x)
+        return x
+
+    def _forward_brute_concat(self, x, x_mark, exo_prompt: Tensor):
+        exo_prompt = exo_prompt.unsqueeze(1).expand(-1, x.size(1), -1)
+
+        x = torch.cat([exo_prompt, x], dim=2)  # [B, L, (V + I_S)]
+        x = self.value_embedding(x)  # [B, L, D]
+        x = x + self.position_embedding(x)
+        if x_mark is not None:
+            x = x + self.temporal_embedding(x_mark)
+
+        if self.training and self.dropout.p > 0:
+            x = self.dropout(x)
+        return x
 
 
 class DataEmbedding_inverted_WithExoPromptTuning(nn.Module):
@@ -226,6 +343,7 @@ class DataEmbedding_inverted_WithExoPromptTuning(nn.Module):
 
         self.prompt_tuning_type = prompt_tuning_type
         self.num_virtual_tokens = num_virtual_tokens
+        self.d_model = d_model
         self.exo_prompt_dim = exo_prompt_dim
         self.exo_prompt_projector = nn.Identity()
         self.exo_prompt_projector_hidden_size = exo_prompt_projector_hidden_size
@@ -241,8 +359,10 @@ class DataEmbedding_inverted_WithExoPromptTuning(nn.Module):
                         exo_prompt_projector_hidden_size, d_model * num_virtual_tokens
                     ),
                 )
+                self._forward_impl = type(self)._forward_two_layer_mlp
             case "brute_concat":
                 self.exo_prompt_projector = None
+                self._forward_impl = type(self)._forward_brute_concat
             case _:
                 raise ValueError(
                     f"prompt_tuning_type {prompt_tuning_type} is not supported."
@@ -256,7 +376,10 @@ class DataEmbedding_inverted_WithExoPromptTuning(nn.Module):
         self.value_embedding = nn.Linear(token_embedding_c_in, d_model)
         self.dropout = nn.Dropout(p=dropout)
 
-    def forward(
+    def forward(self, x, x_mark, exo_prompt: Tensor):
+        return self._forward_impl(self, x, x_mark, exo_prompt)
+
+    def _forward_two_layer_mlp(
         self,
         x,  # [B L (seq_len) V (variate)]
         x_mark,  # [B L (seq_len) F (num_features (5))]
@@ -266,107 +389,198 @@ class DataEmbedding_inverted_WithExoPromptTuning(nn.Module):
         x = x.permute(0, 2, 1)
         # x: [Batch Variate Time]
 
-        if self.prompt_tuning_type in ["brute_concat"]:
-            exo_prompt = repeat(
-                exo_prompt, "b v -> b l v", l=x.size(1)
-            )  # l here is num_variate, [B Variate Params]
-        elif self.prompt_tuning_type in ["two_layer_mlp"]:
-            exo_prompt = self.exo_prompt_projector(exo_prompt)
-            exo_prompt = rearrange(
-                exo_prompt, "b (l d) -> b l d", l=self.num_virtual_tokens
-            )  # [B L d_model]
+        exo_prompt = self.exo_prompt_projector(exo_prompt)
+        exo_prompt = exo_prompt.view(
+            exo_prompt.size(0), self.num_virtual_tokens, self.d_model
+        )  # [B L d_model]
 
         if x_mark is None:
-            if self.prompt_tuning_type in ["brute_concat"]:
-                x = torch.cat([x, exo_prompt], dim=2)
-                x = self.value_embedding(x)
-            else:
-                x = self.value_embedding(x)  # [Batch Variate d_model]
-                x = torch.cat(
-                    [x, exo_prompt], dim=1
-                )  # [Batch (num_virtual + Variate) d_model]
+            x = self.value_embedding(x)  # [Batch Variate d_model]
+            x = torch.cat(
+                [x, exo_prompt], dim=1
+            )  # [Batch (num_virtual + Variate) d_model]
         else:
-            x_mark_i = x_mark.permute(0, 2, 1)  # [B F L]
-            if self.prompt_tuning_type in ["brute_concat"]:
-                # TODO: @gsoykan - debug this there should be error...
-                x = torch.cat([x, exo_prompt], dim=2)  # [B Variate (L + I_S)]
-                # padding x_mark_i dim 2 so that they can be catted along dim 1
-                pad_length = x.size(2) - x_mark_i.size(2)
-                x_mark_i = F.pad(x_mark_i, (0, pad_length))
-                x = self.value_embedding(
-                    torch.cat([x, x_mark_i], 1)
-                )  # [Batch Variate d_model], Variate (actual_variate + time)
-            else:
-                # x = self.value_embedding(torch.cat([x, x_mark_i], 1))
-                x = self.value_embedding(
-                    torch.cat([x, x_mark_i], 1)
-                )  # [Batch (Variate + F) d_model]
-                x = torch.cat([x, exo_prompt], dim=1)  # [B, (V + F + L), D]
-
-        return self.dropout(x)
-
-
-class DataEmbedding(nn.Module):
-    def __init__(self, c_in, d_model, embed_type="fixed", freq="h", dropout=0.1):
-        super(DataEmbedding, self).__init__()
+            # integer marks (embed != timeF) are projected like values
+            x_mark_i = x_mark.permute(0, 2, 1).to(x.dtype)  # [B F L]
+            # the projection is per token, so variates and time features
+            # are embedded separately instead of concatenating the inputs
+            x = torch.cat(
+                [
+                    self.value_embedding(x),
+                    self.value_embedding(x_mark_i),
+                    exo_prompt,
+                ],
+                dim=1,
+            )  # [B, (V + F + L), D]
+
+        if self.training and self.dropout.p > 0:
+            x = self.dropout(x)
+        return x
+
+    def _forward_brute_concat(
+        self,
+        x,  # [B L (seq_len) V (variate)]
+        x_mark,  # [B L (seq_len) F (num_features (5))]
+        exo_prompt: Tensor,
+    ):
+        # x: [B L V]
+        x = x.permute(0, 2, 1)
+        # x: [Batch Variate Time]
+
+        exo_prompt = exo_prompt.unsqueeze(1).expand(
+            -1, x.size(1), -1
+        )  # l here is num_variate, [B Variate Params]
+
+        if x_mark is None:
+            x = torch.cat([x, exo_prompt], dim=2)
+            x = self.value_embedding(x)
+        else:
+            x_mark_i = x_mark.permute(0, 2, 1).to(x.dtype)  # [B F L]
+            # TODO: @gsoykan - debug this there should be error...
+            x = torch.cat([x, exo_prompt], dim=2)  # [B Variate (L + I_S)]
+            # time features have no exo prompt part; zero-padding them to
+            # (L + I_S) would only meet zeros, so project them with the
+            # first L weight columns instead of padding and concatenating
+            x_mark_i = F.linear(
+                x_mark_i,
+                self.value_embedding.weight[:, : x_mark_i.size(2)],
+                self.value_embedding.bias,
+            )
+            x = torch.cat(
+                [self.value_embedding(x), x_mark_i], dim=1
+            )  # [Batch Variate d_model], Variate (actual_variate + time)
+
+        if self.training and self.dropout.p > 0:
+            x = self.dropout(x)
+        return x
+
+
+def _accumulate(out, terms):
+    # sum terms into the freshly allocated out in place, but in the dtype an
+    # out-of-place sum would have: under autocast the low-precision value
+    # embedding is promoted rather than the fp32 terms rounded to it
+    dtype = functools.reduce(torch.promote_types, [t.dtype for t in terms], out.dtype)
+    out = out.to(dtype)
+    for t in terms:
+        out += t
+    return out
+
+
+class _CompilableEmbedding(nn.Module):
+    # subclasses define _forward(x, x_mark), a chain of small launch-bound
+    # ops that inductor fuses with use_compile; the unbound function is
+    # compiled so DataParallel replicas still run with their own parameters
+    def __init__(self, use_compile=False):
+        super(_CompilableEmbedding, self).__init__()
+        forward = type(self)._forward
+        self._forward_impl = (
+            torch.compile(forward, dynamic=True) if use_compile else forward
+        )
+
+    def forward(self, x, x_mark):
+        return self._forward_impl(self, x, x_mark)
+
+
+class DataEmbedding(_CompilableEmbedding):
+    def __init__(
+        self,
+        c_in,
+        d_model,
+        embed_type="fixed",
+        freq="h",
+        dropout=0.1,
+        use_compile=False,
+        temporal_storage="fp32",  # fp32, bf16, int8
+    ):
+        super(DataEmbedding, self).__init__(use_compile)
 
         self.value_embedding = TokenEmbedding(c_in=c_in, d_model=d_model)
         self.position_embedding = PositionalEmbedding(d_model=d_model)
         self.temporal_embedding = (
-            TemporalEmbedding(d_model=d_model, embed_type=embed_type, freq=freq)
+            TemporalEmbedding(
+                d_model=d_model,
+                embed_type=embed_type,
+                freq=freq,
+                storage=temporal_storage,
+            )
             if embed_type != "timeF"
             else TimeFeatureEmbedding(d_model=d_model, embed_type=embed_type, freq=freq)
         )
-        self.dropout = nn.Dropout(p=dropout)
+        self.dropout = nn.Dropout(p=dropout, inplace=True)
 
-    def forward(self, x, x_mark):
-        if x_mark is None:
-            x = self.value_embedding(x) + self.position_embedding(x)
-        else:
-            x = (
-                self.value_embedding(x)
-                + self.temporal_embedding(x_mark)
-                + self.position_embedding(x)
-            )
-        return self.dropout(x)
+    def _forward(self, x, x_mark):
+        # the eager path makes a single [B, L, D] buffer, see _accumulate; the
+        # compiled path fuses the adds and dropout into one kernel
+        terms = [] if x_mark is None else [self.temporal_embedding(x_mark)]
+        terms.append(self.position_embedding(x))
+        out = _accumulate(self.value_embedding(x), terms)
+        if self.training and self.dropout.p > 0:
+            out = self.dropout(out)
+        return out
 
 
-class DataEmbedding_inverted(nn.Module):
-    def __init__(self, c_in, d_model, embed_type="fixed", freq="h", dropout=0.1):
-        super(DataEmbedding_inverted, self).__init__()
+class DataEmbedding_inverted(_CompilableEmbedding):
+    def __init__(
+        self,
+        c_in,
+        d_model,
+        embed_type="fixed",
+        freq="h",
+        dropout=0.1,
+        use_compile=False,
+    ):
+        super(DataEmbedding_inverted, self).__init__(use_compile)
         self.value_embedding = nn.Linear(c_in, d_model)
         self.dropout = nn.Dropout(p=dropout)
 
-    def forward(self, x, x_mark):
+    def _forward(self, x, x_mark):
         x = x.permute(0, 2, 1)
         # x: [Batch Variate Time]
         if x_mark is None:
             x = self.value_embedding(x)
         else:
-            x = self.value_embedding(torch.cat([x, x_mark.permute(0, 2, 1)], 1))
+            x = self.value_embedding(
+                torch.cat([x, x_mark.permute(0, 2, 1).to(x.dtype)], 1)
+            )
         # x: [Batch Variate d_model]
-        return self.dropout(x)
+        if self.training and self.dropout.p > 0:
+            x = self.dropout(x)
+        return x
 
 
-class DataEmbedding_wo_pos(nn.Module):
-    def __init__(self, c_in, d_model, embed_type="fixed", freq="h", dropout=0.1):
-        super(DataEmbedding_wo_pos, self).__init__()
+class DataEmbedding_wo_pos(_CompilableEmbedding):
+    def __init__(
+        self,
+        c_in,
+        d_model,
+        embed_type="fixed",
+        freq="h",
+        dropout=0.1,
+        use_compile=False,
+        temporal_storage="fp32",  # fp32, bf16, int8
+    ):
+        super(DataEmbedding_wo_pos, self).__init__(use_compile)
 
         self.value_embedding = TokenEmbedding(c_in=c_in, d_model=d_model)
         self.position_embedding = PositionalEmbedding(d_model=d_model)
         self.temporal_embedding = (
-            TemporalEmbedding(d_model=d_model, embed_type=embed_type, freq=freq)
+            TemporalEmbedding(
+                d_model=d_model,
+                embed_type=embed_type,
+                freq=freq,
+                storage=temporal_storage,
+            )
             if embed_type != "timeF"
             else TimeFeatureEmbedding(d_model=d_model, embed_type=embed_type, freq=freq)
         )
-        self.dropout = nn.Dropout(p=dropout)
+        self.dropout = nn.Dropout(p=dropout, inplace=True)
 
-    def forward(self, x, x_mark):
-        if x_mark is None:
-            x = self.value_embedding(x)
-        else:
-            x = self.value_embedding(x) + self.temporal_embedding(x_mark)
-        return self.dropout(x)
+    def _forward(self, x, x_mark):
+        terms = [] if x_mark is None else [self.temporal_embedding(x_mark)]
+        out = _accumulate(self.value_embedding(x), terms)
+        if self.training and self.dropout.p > 0:
+            out = self.dropout(out)
+        return out
 
 
 class PatchEmbedding(nn.Module):
@@ -390,8 +604,12 @@ class PatchEmbedding(nn.Module):
         # do patching
         n_vars = x.shape[1]
         x = self.padding_patch_layer(x)
+        # [B, n_vars, n_patch, patch_len], kept as a strided view
         x = x.unfold(dimension=-1, size=self.patch_len, step=self.stride)
+        # Input encoding on the view, so only the projected output is reshaped
+        x = F.linear(x, self.value_embedding.weight)
         x = torch.reshape(x, (x.shape[0] * x.shape[1], x.shape[2], x.shape[3]))
-        # Input encoding
-        x = self.value_embedding(x) + self.position_embedding(x)
-        return self.dropout(x), n_vars
+        x = x + self.position_embedding(x)
+        if self.training and self.dropout.p > 0:
+            x = self.dropout(x)
+        return x, n_vars
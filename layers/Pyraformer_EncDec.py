@@ -114,7 +114,8 @@ class Encoder(nn.Module):
         ])  # naive pyramid attention
 
         self.enc_embedding = DataEmbedding(
-            configs.enc_in, configs.d_model, configs.dropout)
+            configs.enc_in, configs.d_model, configs.dropout,
+            use_compile=getattr(configs, "compile_embedding", False))
         self.conv_layers = Bottleneck_Construct(
             configs.d_model, window_size, d_bottleneck)
 
@@ -28,7 +28,9 @@ class Model(nn.Module):
 
         # Embedding
         self.enc_embedding = DataEmbedding_wo_pos(configs.enc_in, configs.d_model, configs.embed, configs.freq,
-                                                  configs.dropout)
+                                                  configs.dropout,
+                                                  use_compile=getattr(configs, "compile_embedding", False),
+                                                  temporal_storage=getattr(configs, "temporal_storage", "fp32"))
         # Encoder
         self.encoder = Encoder(
             [
@@ -49,7 +51,9 @@ class Model(nn.Module):
         # Decoder
         if self.task_name == 'long_term_forecast' or self.task_name == 'short_term_forecast':
             self.dec_embedding = DataEmbedding_wo_pos(configs.dec_in, configs.d_model, configs.embed, configs.freq,
-                                                      configs.dropout)
+                                                      configs.dropout,
+                                                      use_compile=getattr(configs, "compile_embedding", False),
+                                                      temporal_storage=getattr(configs, "temporal_storage", "fp32"))
             self.decoder = Decoder(
                 [
                     DecoderLayer(
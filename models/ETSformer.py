@@ -23,7 +23,9 @@ class Model(nn.Module):
 
         # Embedding
         self.enc_embedding = DataEmbedding(configs.enc_in, configs.d_model, configs.embed, configs.freq,
-                                           configs.dropout)
+                                           configs.dropout,
+                                           use_compile=getattr(configs, "compile_embedding", False),
+                                           temporal_storage=getattr(configs, "temporal_storage", "fp32"))
 
         # Encoder
         self.encoder = Encoder(
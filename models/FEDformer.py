@@ -33,9 +33,13 @@ class Model(nn.Module):
         # Decomp
         self.decomp = series_decomp(configs.moving_avg)
         self.enc_embedding = DataEmbedding(configs.enc_in, configs.d_model, configs.embed, configs.freq,
-                                           configs.dropout)
+                                           configs.dropout,
+                                           use_compile=getattr(configs, "compile_embedding", False),
+                                           temporal_storage=getattr(configs, "temporal_storage", "fp32"))
         self.dec_embedding = DataEmbedding(configs.dec_in, configs.d_model, configs.embed, configs.freq,
-                                           configs.dropout)
+                                           configs.dropout,
+                                           use_compile=getattr(configs, "compile_embedding", False),
+                                           temporal_storage=getattr(configs, "temporal_storage", "fp32"))
 
         if self.version == 'Wavelets':
             encoder_self_att = MultiWaveletTransform(ich=configs.d_model, L=1, base='legendre')
@@ -133,7 +133,9 @@ class Model(nn.Module):
 
         # embedding
         self.dec_embedding = DataEmbedding(configs.enc_in, configs.d_model, configs.embed, configs.freq,
-                                           configs.dropout)
+                                           configs.dropout,
+                                           use_compile=getattr(configs, "compile_embedding", False),
+                                           temporal_storage=getattr(configs, "temporal_storage", "fp32"))
 
         self.conv_trans = SeasonalPrediction(embedding_size=configs.d_model, n_heads=configs.n_heads,
                                              dropout=configs.dropout,
@@ -30,21 +30,11 @@ def get_known_len(embed_type, freq):
 
 
 class TFTTemporalEmbedding(TemporalEmbedding):
-    def __init__(self, d_model, embed_type='fixed', freq='h'):
-        super(TFTTemporalEmbedding, self).__init__(d_model, embed_type, freq)
+    def __init__(self, d_model, embed_type='fixed', freq='h', storage='fp32'):
+        super(TFTTemporalEmbedding, self).__init__(d_model, embed_type, freq, storage)
 
     def forward(self, x):
-        x = x.long()
-        minute_x = self.minute_embed(x[:, :, 4]) if hasattr(
-            self, 'minute_embed') else 0.
-        hour_x = self.hour_embed(x[:, :, 3])
-        weekday_x = self.weekday_embed(x[:, :, 2])
-        day_x = self.day_embed(x[:, :, 1])
-        month_x = self.month_embed(x[:, :, 0])
-
-        embedding_x = torch.stack([month_x, day_x, weekday_x, hour_x, minute_x], dim=-2) if hasattr(
-            self, 'minute_embed') else torch.stack([month_x, day_x, weekday_x, hour_x], dim=-2)
-        return embedding_x
+        return self.lookup(x)
 
 
 class TFTTimeFeatureEmbedding(nn.Module):
@@ -66,10 +56,12 @@ class TFTEmbedding(nn.Module):
         self.static_len = len(self.static_pos)
         self.observed_len = len(self.observed_pos)
 
-        self.static_embedding = nn.ModuleList([DataEmbedding(1,configs.d_model,dropout=configs.dropout) for _ in range(self.static_len)]) \
+        use_compile = getattr(configs, 'compile_embedding', False)
+        self.static_embedding = nn.ModuleList([DataEmbedding(1,configs.d_model,dropout=configs.dropout,use_compile=use_compile) for _ in range(self.static_len)]) \
             if self.static_len else None
-        self.observed_embedding = nn.ModuleList([DataEmbedding(1,configs.d_model,dropout=configs.dropout) for _ in range(self.observed_len)])
-        self.known_embedding = TFTTemporalEmbedding(configs.d_model, configs.embed, configs.freq) \
+        self.observed_embedding = nn.ModuleList([DataEmbedding(1,configs.d_model,dropout=configs.dropout,use_compile=use_compile) for _ in range(self.observed_len)])
+        self.known_embedding = TFTTemporalEmbedding(configs.d_model, configs.embed, configs.freq,
+                                                    getattr(configs, 'temporal_storage', 'fp32')) \
             if configs.embed != 'timeF' else TFTTimeFeatureEmbedding(configs.d_model, configs.embed, configs.freq)
 
     def forward(self, x_enc, x_mark_enc, x_dec, x_mark_dec):
@@ -92,7 +92,7 @@ class Model(nn.Module):
         stdev = torch.sqrt(torch.var(x_enc, dim=1, keepdim=True, unbiased=False) + 1e-5)
         x_enc /= stdev
         
-        feature = self.feature_encoder(batch_y_mark)
+        feature = self.feature_encoder(batch_y_mark.to(x_enc.dtype))
         hidden = self.encoders(torch.cat([x_enc, feature.reshape(feature.shape[0], -1)], dim=-1))
         decoded = self.decoders(hidden).reshape(hidden.shape[0], self.pred_len, self.decode_dim)
         dec_out = self.temporalDecoder(torch.cat([feature[:,self.seq_len:], decoded], dim=-1)).squeeze(-1) + self.residual_proj(x_enc)
@@ -110,7 +110,7 @@ class Model(nn.Module):
         stdev = torch.sqrt(torch.var(x_enc, dim=1, keepdim=True, unbiased=False) + 1e-5)
         x_enc /= stdev
 
-        feature = self.feature_encoder(x_mark_enc)
+        feature = self.feature_encoder(x_mark_enc.to(x_enc.dtype))
         hidden = self.encoders(torch.cat([x_enc, feature.reshape(feature.shape[0], -1)], dim=-1))
         decoded = self.decoders(hidden).reshape(hidden.shape[0], self.seq_len, self.decode_dim)
         dec_out = self.temporalDecoder(torch.cat([feature[:,:self.seq_len], decoded], dim=-1)).squeeze(-1) + self.residual_proj(x_enc)
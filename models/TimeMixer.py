@@ -203,10 +203,14 @@ class Model(nn.Module):
 
         if self.channel_independence:
             self.enc_embedding = DataEmbedding_wo_pos(1, configs.d_model, configs.embed, configs.freq,
-                                                      configs.dropout)
+                                                      configs.dropout,
+                                                      use_compile=getattr(configs, "compile_embedding", False),
+                                                      temporal_storage=getattr(configs, "temporal_storage", "fp32"))
         else:
             self.enc_embedding = DataEmbedding_wo_pos(configs.enc_in, configs.d_model, configs.embed, configs.freq,
-                                                      configs.dropout)
+                                                      configs.dropout,
+                                                      use_compile=getattr(configs, "compile_embedding", False),
+                                                      temporal_storage=getattr(configs, "temporal_storage", "fp32"))
 
         self.layer = configs.e_layers
 
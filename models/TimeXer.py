@@ -140,6 +140,7 @@ class Model(nn.Module):
             configs.embed,
             configs.freq,
             configs.dropout,
+            use_compile=getattr(configs, "compile_embedding", False),
         )
 
         # Encoder-only architecture
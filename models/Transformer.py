@@ -21,6 +21,8 @@ class Model(nn.Module):
         self.task_name = configs.task_name
         self.pred_len = configs.pred_len
         # Embedding
+        use_compile = getattr(configs, "compile_embedding", False)
+        temporal_storage = getattr(configs, "temporal_storage", "fp32")
         if (
             hasattr(configs, "enable_exo_prompt_tuning")
             and configs.enable_exo_prompt_tuning
@@ -35,6 +37,7 @@ class Model(nn.Module):
                 configs.num_virtual_tokens,
                 configs.exo_prompt_dim,
                 configs.exo_prompt_projector_hidden_size,
+                temporal_storage=temporal_storage,
             )
         else:
             self.enc_embedding = DataEmbedding(
@@ -43,6 +46,8 @@ class Model(nn.Module):
                 configs.embed,
                 configs.freq,
                 configs.dropout,
+                use_compile=use_compile,
+                temporal_storage=temporal_storage,
             )
         # Encoder
         self.encoder = Encoder(
@@ -78,6 +83,8 @@ class Model(nn.Module):
                 configs.embed,
                 configs.freq,
                 configs.dropout,
+                use_compile=use_compile,
+                temporal_storage=temporal_storage,
             )
             self.decoder = Decoder(
                 [
@@ -23,6 +23,7 @@ class Model(nn.Module):
         self.seq_len = configs.seq_len
         self.pred_len = configs.pred_len
         # Embedding
+        use_compile = getattr(configs, "compile_embedding", False)
         if (
             hasattr(configs, "enable_exo_prompt_tuning")
             and configs.enable_exo_prompt_tuning
@@ -45,6 +46,7 @@ class Model(nn.Module):
                 configs.embed,
                 configs.freq,
                 configs.dropout,
+                use_compile=use_compile,
             )
         # Encoder
         self.encoder = Encoder(
@@ -197,6 +197,20 @@ if __name__ == "__main__":
         help="use automatic mixed precision training",
         default=False,
     )
+    parser.add_argument(
+        "--compile_embedding",
+        action="store_true",
+        help="compile the data embedding forwards with torch.compile "
+        "(not the exo prompt embeddings)",
+        default=False,
+    )
+    parser.add_argument(
+        "--temporal_storage",
+        type=str,
+        default="fp32",
+        choices=["fp32", "bf16", "int8"],
+        help="storage of the fixed temporal embedding table (embed=fixed)",
+    )
 
     # GPU
     parser.add_argument("--use_gpu", type=bool, default=True, help="use gpu")